@@ -14,90 +14,105 @@ class Backtester:
         self.config = config
         self.db = db_manager
         self.initial_capital = config.INITIAL_CAPITAL
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        """Return the cached result for key while the trades table is unchanged"""
+        version = self.db.get_trades_version()
+        if version is None:
+            return compute()
+
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        result = compute()
+        self._cache[key] = (version, result)
+        return result
 
     def calculate_statistics(self):
         """Calculate comprehensive backtest statistics"""
         try:
-            trades = self.db.get_all_trades()
-
-            if not trades:
-                return self.get_empty_statistics()
-
-            df = pd.DataFrame(trades)
-
-            # Basic statistics
-            total_trades = len(df)
-            winning_trades = len(df[df['pnl'] > 0])
-            losing_trades = len(df[df['pnl'] < 0])
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-
-            # PnL statistics
-            total_pnl = df['pnl'].sum()
-            avg_win = df[df['pnl'] > 0]['pnl'].mean() if winning_trades > 0 else 0
-            avg_loss = abs(df[df['pnl'] < 0]['pnl'].mean()) if losing_trades > 0 else 0
-
-            # Calculate profit factor
-            gross_profit = df[df['pnl'] > 0]['pnl'].sum() if winning_trades > 0 else 0
-            gross_loss = abs(df[df['pnl'] < 0]['pnl'].sum()) if losing_trades > 0 else 0
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-
-            # Calculate maximum drawdown
-            cumulative_pnl = df['pnl'].cumsum()
-            running_max = cumulative_pnl.cummax()
-            drawdown = cumulative_pnl - running_max
-            max_drawdown = drawdown.min()
-            max_drawdown_pct = (max_drawdown / self.initial_capital * 100) if self.initial_capital > 0 else 0
-
-            # Calculate Sharpe ratio (simplified)
-            returns = df['pnl_percentage'] / 100
-            sharpe_ratio = (returns.mean() / returns.std() * np.sqrt(252)) if returns.std() > 0 else 0
-
-            # Calculate expected value
-            expected_value = (win_rate / 100 * avg_win) - ((1 - win_rate / 100) * avg_loss)
-
-            # Time-based statistics
-            if 'entry_time' in df.columns:
-                df['entry_time'] = pd.to_datetime(df['entry_time'])
-                first_trade = df['entry_time'].min()
-                last_trade = df['entry_time'].max()
-                trading_days = (last_trade - first_trade).days + 1
-                trades_per_day = total_trades / trading_days if trading_days > 0 else 0
-            else:
-                trading_days = 0
-                trades_per_day = 0
-
-            # ROI calculation
-            ending_capital = self.initial_capital + total_pnl
-            roi = ((ending_capital - self.initial_capital) / self.initial_capital * 100) if self.initial_capital > 0 else 0
-
-            statistics = {
-                'total_trades': total_trades,
-                'winning_trades': winning_trades,
-                'losing_trades': losing_trades,
-                'win_rate': round(win_rate, 2),
-                'total_pnl': round(total_pnl, 2),
-                'avg_win': round(avg_win, 2),
-                'avg_loss': round(avg_loss, 2),
-                'profit_factor': round(profit_factor, 2),
-                'max_drawdown': round(max_drawdown, 2),
-                'max_drawdown_pct': round(max_drawdown_pct, 2),
-                'sharpe_ratio': round(sharpe_ratio, 2),
-                'expected_value': round(expected_value, 2),
-                'roi': round(roi, 2),
-                'initial_capital': self.initial_capital,
-                'ending_capital': round(ending_capital, 2),
-                'trading_days': trading_days,
-                'trades_per_day': round(trades_per_day, 2),
-                'gross_profit': round(gross_profit, 2),
-                'gross_loss': round(gross_loss, 2),
-            }
-
-            return statistics
-
+            return self._cached('statistics', self._compute_statistics)
         except Exception as e:
             logger.error(f"Error calculating statistics: {e}")
             return self.get_empty_statistics()
 
+    def _compute_statistics(self):
+        agg = self.db.get_aggregate_stats()
+
+        if not agg or not agg['total']:
+            return self.get_empty_statistics()
+
+        # Basic statistics
+        total_trades = agg['total']
+        winning_trades = agg['wins']
+        losing_trades = agg['losses']
+        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+
+        # PnL statistics
+        total_pnl = agg['sum_pnl']
+        gross_profit = agg['sum_wins']
+        gross_loss = abs(agg['sum_losses'])
+        avg_win = gross_profit / winning_trades if winning_trades > 0 else 0
+        avg_loss = gross_loss / losing_trades if losing_trades > 0 else 0
+
+        # Calculate profit factor
+        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+
+        # Maximum drawdown is tracked incrementally as trades are inserted
+        max_drawdown = agg['max_drawdown']
+        max_drawdown_pct = (max_drawdown / self.initial_capital * 100) if self.initial_capital > 0 else 0
+
+        # Calculate Sharpe ratio (simplified) from the sums of percentage returns
+        n_ret = agg['n_ret']
+        if n_ret > 1:
+            mean_return = agg['sum_ret'] / n_ret / 100
+            variance = (agg['sum_ret_sq'] - agg['sum_ret'] ** 2 / n_ret) / (n_ret - 1) / 10000
+            sharpe_ratio = (mean_return / np.sqrt(variance) * np.sqrt(252)) if variance > 1e-12 else 0
+        else:
+            sharpe_ratio = 0
+
+        # Calculate expected value
+        expected_value = (win_rate / 100 * avg_win) - ((1 - win_rate / 100) * avg_loss)
+
+        # Time-based statistics
+        if agg['min_entry_time'] is not None and agg['max_entry_time'] is not None:
+            # Entry times are stored as Unix seconds
+            trading_days = int(agg['max_entry_time'] - agg['min_entry_time']) // 86400 + 1
+            trades_per_day = total_trades / trading_days if trading_days > 0 else 0
+        else:
+            trading_days = 0
+            trades_per_day = 0
+
+        # ROI calculation
+        ending_capital = self.initial_capital + total_pnl
+        roi = ((ending_capital - self.initial_capital) / self.initial_capital * 100) if self.initial_capital > 0 else 0
+
+        statistics = {
+            'total_trades': total_trades,
+            'winning_trades': winning_trades,
+            'losing_trades': losing_trades,
+            'win_rate': round(win_rate, 2),
+            'total_pnl': round(total_pnl, 2),
+            'avg_win': round(avg_win, 2),
+            'avg_loss': round(avg_loss, 2),
+            'profit_factor': round(profit_factor, 2),
+            'max_drawdown': round(max_drawdown, 2),
+            'max_drawdown_pct': round(max_drawdown_pct, 2),
+            'sharpe_ratio': round(sharpe_ratio, 2),
+            'expected_value': round(expected_value, 2),
+            'roi': round(roi, 2),
+            'initial_capital': self.initial_capital,
+            'ending_capital': round(ending_capital, 2),
+            'trading_days': trading_days,
+            'trades_per_day': round(trades_per_day, 2),
+            'gross_profit': round(gross_profit, 2),
+            'gross_loss': round(gross_loss, 2),
+        }
+
+        return statistics
+
     def get_empty_statistics(self):
         """Return empty statistics structure"""
         return {
@@ -125,67 +140,58 @@ class Backtester:
     def get_performance_chart_data(self):
         """Get data for performance chart"""
         try:
-            trades = self.db.get_all_trades()
-
-            if not trades:
-                return {'labels': [], 'cumulative_pnl': [], 'trade_pnl': []}
+            return self._cached('chart_data', self._compute_performance_chart_data)
+        except Exception as e:
+            logger.error(f"Error getting chart data: {e}")
+            return {'labels': [], 'cumulative_pnl': [], 'trade_pnl': []}
 
-            df = pd.DataFrame(trades)
-            df = df.sort_values('entry_time')
+    def _compute_performance_chart_data(self):
+        pnl, cumulative_pnl, entry_time = self.db.get_pnl_array()
 
-            cumulative_pnl = df['pnl'].cumsum().tolist()
-            trade_pnl = df['pnl'].tolist()
+        if not len(pnl):
+            return {'labels': [], 'cumulative_pnl': [], 'trade_pnl': []}
 
-            # Format timestamps for chart
-            labels = []
-            for idx, row in df.iterrows():
-                if pd.notna(row.get('entry_time')):
-                    labels.append(str(row['entry_time'])[:19])
-                else:
-                    labels.append(f"Trade {idx + 1}")
+        # Cumulative PnL is materialized on insert, so there is no cumsum here.
+        # Arrays are returned as-is; the web layer serializes them with orjson.
+        cumulative_pnl = np.nan_to_num(cumulative_pnl)
+        trade_pnl = np.nan_to_num(pnl)
 
-            return {
-                'labels': labels,
-                'cumulative_pnl': cumulative_pnl,
-                'trade_pnl': trade_pnl,
-            }
+        # Format timestamps for chart
+        labels = np.char.replace(np.datetime_as_string(entry_time, unit='s'), 'T', ' ')
+        fallback = np.char.add('Trade ', np.arange(1, len(labels) + 1).astype(str))
+        labels = np.where(np.isnat(entry_time), fallback, labels).tolist()
 
-        except Exception as e:
-            logger.error(f"Error getting chart data: {e}")
-            return {'labels': [], 'cumulative_pnl': [], 'trade_pnl': []}
+        return {
+            'labels': labels,
+            'cumulative_pnl': cumulative_pnl,
+            'trade_pnl': trade_pnl,
+        }
 
     def get_token_performance(self):
         """Get performance by token"""
         try:
-            trades = self.db.get_all_trades()
-
-            if not trades:
-                return []
-
-            df = pd.DataFrame(trades)
-
-            # Group by token symbol
-            token_stats = df.groupby('token_symbol').agg({
-                'pnl': ['sum', 'mean', 'count'],
-                'pnl_percentage': 'mean'
-            }).round(2)
+            return self._cached('token_performance', self._compute_token_performance)
+        except Exception as e:
+            logger.error(f"Error getting token performance: {e}")
+            return []
 
-            token_stats.columns = ['total_pnl', 'avg_pnl', 'trade_count', 'avg_pnl_pct']
-            token_stats = token_stats.reset_index()
+    def _compute_token_performance(self):
+        df = pd.DataFrame(self.db.get_trades_columns(('token_symbol', 'pnl', 'pnl_percentage')))
 
-            # Calculate win rate per token
-            win_rates = []
-            for token in token_stats['token_symbol']:
-                token_trades = df[df['token_symbol'] == token]
-                wins = len(token_trades[token_trades['pnl'] > 0])
-                total = len(token_trades)
-                win_rate = (wins / total * 100) if total > 0 else 0
-                win_rates.append(round(win_rate, 2))
+        if df.empty:
+            return []
 
-            token_stats['win_rate'] = win_rates
+        df['is_win'] = (df['pnl'] > 0).astype(np.int8)
 
-            return token_stats.to_dict('records')
+        # Group by token symbol; win rate is the mean of the win flag
+        token_stats = df.groupby('token_symbol').agg(
+            total_pnl=('pnl', 'sum'),
+            avg_pnl=('pnl', 'mean'),
+            trade_count=('pnl', 'count'),
+            avg_pnl_pct=('pnl_percentage', 'mean'),
+            win_rate=('is_win', 'mean'),
+        )
+        token_stats['win_rate'] *= 100
+        token_stats = token_stats.round(2).reset_index()
 
-        except Exception as e:
-            logger.error(f"Error getting token performance: {e}")
-            return []
\ No newline at end of file
+        return token_stats.to_dict('records')
@@ -0,0 +1,50 @@
+"""
+Vectorized trade calculations (array forms of the TradeCalculator helpers)
+"""
+
+import numpy as np
+
+
+def pnl(entry, exit_, size):
+    """Profit/loss in USD and percentage for arrays of trades"""
+    ret = np.asarray(exit_, dtype=np.float64) / np.asarray(entry, dtype=np.float64) - 1
+    return size * ret, ret * 100
+
+
+def take_profit_price(entry, take_profit_pct):
+    """Take profit prices for an array of entry prices"""
+    return np.asarray(entry, dtype=np.float64) * (1 + take_profit_pct / 100)
+
+
+def stop_loss_price(entry, stop_loss_pct):
+    """Stop loss prices for an array of entry prices"""
+    return np.asarray(entry, dtype=np.float64) * (1 - stop_loss_pct / 100)
+
+
+def simulate_exits(entries, sizes, take_profit_pct, stop_loss_pct, win_rate, rng):
+    """Simulate take profit / stop loss exits for many trades at once
+
+    Each trade hits take profit with probability win_rate, drawn from rng.
+    Returns a structured array with one record per entry price.
+    """
+    entries = np.asarray(entries, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+
+    # For backtesting, randomly determine if TP or SL was hit
+    hit_tp = rng.random(len(entries)) < win_rate
+
+    results = np.empty(len(entries), dtype=[
+        ('take_profit_price', np.float64),
+        ('stop_loss_price', np.float64),
+        ('exit_price', np.float64),
+        ('hit_take_profit', np.bool_),
+        ('pnl', np.float64),
+        ('pnl_percentage', np.float64),
+    ])
+    results['take_profit_price'] = take_profit_price(entries, take_profit_pct)
+    results['stop_loss_price'] = stop_loss_price(entries, stop_loss_pct)
+    results['exit_price'] = np.where(hit_tp, results['take_profit_price'], results['stop_loss_price'])
+    results['hit_take_profit'] = hit_tp
+    results['pnl'], results['pnl_percentage'] = pnl(entries, results['exit_price'], sizes)
+
+    return results
@@ -3,6 +3,7 @@ Configuration settings for the trading backtest system
 """
 
 import os
+import re
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,17 +22,33 @@ class Config:
     RISK_REWARD_RATIO = 1.5
     INITIAL_CAPITAL = 10000.0  # Starting capital for backtest
     POSITION_SIZE = 100.0  # Amount to invest per trade
+    SIMULATED_WIN_RATE = 0.6  # Probability that a simulated trade hits take profit
 
     # Database settings
     DATABASE_PATH = 'data/trades.db'
 
+    # Price API settings
+    DEXSCREENER_API_URL = 'https://api.dexscreener.com/latest/dex'
+    DEXSCREENER_BATCH_SIZE = 30  # Max addresses per /tokens request
+    PRICE_CACHE_TTL = 30  # Seconds a fetched price is reused
+    PRICE_CACHE_SIZE = 4096  # Token prices kept in memory
+    PRICE_VALIDATOR_CACHE_SIZE = 1024  # ETag/Last-Modified entries kept for conditional GETs
+    PRICE_API_BURST = 10  # Requests allowed back to back
+    PRICE_API_RATE = 5.0  # Sustained requests per second
+    PRICE_RETRY_BASE = 0.5  # Seconds; backoff ceiling doubles per attempt
+    PRICE_RETRY_CAP = 30.0  # Seconds; upper bound on a single backoff
+    PRICE_FETCH_WORKERS = 16  # Threads fetching price batches concurrently
+
     # Web interface settings
     WEB_PORT = 5000
+    WEB_THREADS = 8  # Worker threads serving dashboard requests
+    API_CACHE_TTL = 5  # Seconds dashboard aggregates are reused across requests
 
     # Monitoring settings
     CHECK_INTERVAL = 5  # Check for new messages every 5 seconds
     MAX_RETRIES = 3
     RETRY_DELAY = 10  # Seconds between retries
+    MAX_PROCESSED_MESSAGES = 100_000  # Message ids remembered for de-duplication
 
     # Logging
     LOG_LEVEL = 'INFO'
@@ -52,4 +69,11 @@ class Config:
         r'Entry:\s*\$?([\d.]+)',
         r'\$?([\d.]+)\s*USD',
         r'Buy at:\s*\$?([\d.]+)',
-    ]
\ No newline at end of file
+    ]
+
+    # Compiled once at import; each pattern above must have exactly one capturing group
+    TOKEN_PATTERNS_RE = [re.compile(p, re.IGNORECASE) for p in TOKEN_PATTERNS]
+    TOKEN_PATTERNS_UNION = re.compile('|'.join(f'(?:{p})' for p in TOKEN_PATTERNS), re.IGNORECASE)
+    PRICE_PATTERNS_RE = [re.compile(p, re.IGNORECASE) for p in PRICE_PATTERNS]
+    PRICE_PATTERNS_UNION = re.compile('|'.join(f'(?:{p})' for p in PRICE_PATTERNS), re.IGNORECASE)
+    ADDRESS_PATTERN_RE = re.compile(r'[A-Za-z0-9]{32,44}')
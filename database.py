@@ -5,25 +5,166 @@ Database operations for storing and retrieving trade data
 import sqlite3
 import logging
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-import threading
+import itertools
+import queue
+from contextlib import contextmanager
+
+import numpy as np
+
+from kernels import trade_stats_kernel
 
 logger = logging.getLogger(__name__)
 
+_INSERT_TRADE_SQL = '''
+    INSERT INTO trades (
+        token_symbol, token_address, entry_price, exit_price,
+        entry_time, exit_time, position_size, take_profit_price,
+        stop_loss_price, take_profit_percentage, stop_loss_percentage,
+        exit_type, pnl, pnl_percentage, status, message_id,
+        message_text, channel
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Full-table aggregates, used to (re)build the running_stats row
+_AGGREGATE_SQL = '''
+    SELECT
+        COUNT(*) AS total,
+        COUNT(CASE WHEN pnl > 0 THEN 1 END) AS wins,
+        COUNT(CASE WHEN pnl < 0 THEN 1 END) AS losses,
+        COALESCE(SUM(pnl), 0) AS sum_pnl,
+        COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl END), 0) AS sum_wins,
+        COALESCE(SUM(CASE WHEN pnl < 0 THEN pnl END), 0) AS sum_losses,
+        MIN(entry_time) AS min_entry_time,
+        MAX(entry_time) AS max_entry_time,
+        COUNT(pnl_percentage) AS n_ret
+    FROM trades
+'''
+
+# NumPy dtype per trades column for columnar reads; nullable integers are read as float
+_TRADE_COLUMN_DTYPES = {
+    'id': np.int64,
+    'token_symbol': object,
+    'token_address': object,
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'entry_time': np.int64,
+    'exit_time': object,
+    'position_size': np.float64,
+    'take_profit_price': np.float64,
+    'stop_loss_price': np.float64,
+    'take_profit_percentage': np.float64,
+    'stop_loss_percentage': np.float64,
+    'exit_type': object,
+    'pnl': np.float64,
+    'pnl_percentage': np.float64,
+    'status': object,
+    'message_id': np.float64,
+    'message_text': object,
+    'channel': object,
+    'created_at': object,
+    'cum_pnl': np.float64,
+}
+
+# Trade columns that feed running_stats; updating them forces a rebuild
+_RUNNING_STATS_INPUTS = {'pnl', 'pnl_percentage', 'entry_time'}
+
+
+def _to_epoch(value):
+    """Convert a timestamp to integer Unix seconds (naive datetimes are taken as UTC)"""
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _trade_row(trade_data):
+    """Map a trade dict onto the _INSERT_TRADE_SQL parameters"""
+    return (
+        trade_data.get('token_symbol'),
+        trade_data.get('token_address'),
+        trade_data.get('entry_price'),
+        trade_data.get('exit_price'),
+        _to_epoch(trade_data.get('entry_time')),
+        trade_data.get('exit_time'),
+        trade_data.get('position_size'),
+        trade_data.get('take_profit_price'),
+        trade_data.get('stop_loss_price'),
+        trade_data.get('take_profit_percentage'),
+        trade_data.get('stop_loss_percentage'),
+        trade_data.get('exit_type'),
+        trade_data.get('pnl'),
+        trade_data.get('pnl_percentage'),
+        trade_data.get('status', 'OPEN'),
+        trade_data.get('message_id'),
+        trade_data.get('message_text'),
+        trade_data.get('channel'),
+    )
+
+
 class DatabaseManager:
-    def __init__(self, db_path='data/trades.db'):
+    def __init__(self, db_path='data/trades.db', pool_size=10):
         self.db_path = db_path
-        self.lock = threading.Lock()
+        self._pool = queue.LifoQueue(maxsize=pool_size)  # Idle connections; most recently used first
+        self._update_seq = itertools.count(1)
+        self._updates = 0  # Bumped by update_trade, which leaves the count and MAX(id) unchanged
 
         # Create data directory if it doesn't exist
         Path(db_path).parent.mkdir(exist_ok=True)
 
+    def _connect(self):
+        """Open and tune a new connection"""
+        # Pooled connections move between threads, but only one uses each at a time
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)  # Busy timeout for contended writes
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MiB page cache
+        conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB memory map
+        return conn
+
+    @contextmanager
+    def _conn(self):
+        """Borrow a connection from the pool, opening one if none is idle"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction on a pooled connection
+
+        BEGIN IMMEDIATE takes SQLite's write lock up front, so concurrent
+        writers queue on the connection's busy timeout instead of a Python
+        lock, and readers keep running under WAL.
+        """
+        with self._conn() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
     def initialize(self):
         """Initialize database tables"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
+            with self._transaction() as conn:
                 cursor = conn.cursor()
 
                 # Create trades table
@@ -34,7 +175,7 @@ class DatabaseManager:
                         token_address TEXT,
                         entry_price REAL NOT NULL,
                         exit_price REAL,
-                        entry_time TIMESTAMP NOT NULL,
+                        entry_time INTEGER NOT NULL,  -- Unix seconds (UTC)
                         exit_time TIMESTAMP,
                         position_size REAL NOT NULL,
                         take_profit_price REAL,
@@ -48,10 +189,17 @@ class DatabaseManager:
                         message_id INTEGER,
                         message_text TEXT,
                         channel TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        cum_pnl REAL  -- Running PnL total in (entry_time, id) order, set on insert
                     )
                 ''')
 
+                # Databases created before cum_pnl existed; backfilled by the rebuild below
+                columns = {row[1] for row in cursor.execute('PRAGMA table_info(trades)')}
+                added_cum_pnl = 'cum_pnl' not in columns
+                if added_cum_pnl:
+                    cursor.execute('ALTER TABLE trades ADD COLUMN cum_pnl REAL')
+
                 # Create statistics table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS statistics (
@@ -66,13 +214,91 @@ class DatabaseManager:
                     )
                 ''')
 
+                # Running aggregates over all trades, in (entry_time, id) order (single row)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS running_stats (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        total INTEGER NOT NULL DEFAULT 0,
+                        wins INTEGER NOT NULL DEFAULT 0,
+                        losses INTEGER NOT NULL DEFAULT 0,
+                        sum_pnl REAL NOT NULL DEFAULT 0,
+                        sum_wins REAL NOT NULL DEFAULT 0,
+                        sum_losses REAL NOT NULL DEFAULT 0,
+                        min_entry_time INTEGER,
+                        max_entry_time INTEGER,
+                        n_ret INTEGER NOT NULL DEFAULT 0,
+                        sum_ret REAL NOT NULL DEFAULT 0,
+                        sum_ret_sq REAL NOT NULL DEFAULT 0,
+                        cum_pnl REAL NOT NULL DEFAULT 0,
+                        peak_pnl REAL,
+                        max_drawdown REAL NOT NULL DEFAULT 0,
+                        stale INTEGER NOT NULL DEFAULT 0  -- Set when a trade arrives out of entry_time order
+                    )
+                ''')
+
+                # Databases created before the stale flag were accumulated in insertion order
+                columns = {row[1] for row in cursor.execute('PRAGMA table_info(running_stats)')}
+                added_stale = 'stale' not in columns
+                if added_stale:
+                    cursor.execute('ALTER TABLE running_stats ADD COLUMN stale INTEGER NOT NULL DEFAULT 0')
+
+                # Fold every inserted trade into running_stats (and its cum_pnl) in the
+                # same transaction; recreated so older databases pick up changes.
+                # Order-dependent fields (cum_pnl, peak_pnl, max_drawdown) are only valid
+                # for trades arriving in entry_time order; anything older marks the row
+                # stale and the writer rebuilds it before committing.
+                cursor.execute('DROP TRIGGER IF EXISTS trg_trades_running_stats')
+                cursor.execute('''
+                    CREATE TRIGGER trg_trades_running_stats
+                    AFTER INSERT ON trades
+                    BEGIN
+                        UPDATE trades
+                        SET cum_pnl = (SELECT cum_pnl FROM running_stats WHERE id = 1) + COALESCE(NEW.pnl, 0)
+                        WHERE id = NEW.id;
+
+                        UPDATE running_stats SET
+                            total = total + 1,
+                            wins = wins + CASE WHEN NEW.pnl > 0 THEN 1 ELSE 0 END,
+                            losses = losses + CASE WHEN NEW.pnl < 0 THEN 1 ELSE 0 END,
+                            sum_pnl = sum_pnl + COALESCE(NEW.pnl, 0),
+                            sum_wins = sum_wins + CASE WHEN NEW.pnl > 0 THEN NEW.pnl ELSE 0 END,
+                            sum_losses = sum_losses + CASE WHEN NEW.pnl < 0 THEN NEW.pnl ELSE 0 END,
+                            min_entry_time = COALESCE(MIN(min_entry_time, NEW.entry_time), NEW.entry_time),
+                            max_entry_time = COALESCE(MAX(max_entry_time, NEW.entry_time), NEW.entry_time),
+                            n_ret = n_ret + (NEW.pnl_percentage IS NOT NULL),
+                            sum_ret = sum_ret + COALESCE(NEW.pnl_percentage, 0),
+                            sum_ret_sq = sum_ret_sq + COALESCE(NEW.pnl_percentage * NEW.pnl_percentage, 0),
+                            cum_pnl = cum_pnl + COALESCE(NEW.pnl, 0),
+                            peak_pnl = CASE WHEN NEW.pnl IS NULL THEN peak_pnl
+                                ELSE MAX(COALESCE(peak_pnl, cum_pnl + NEW.pnl), cum_pnl + NEW.pnl) END,
+                            max_drawdown = CASE WHEN NEW.pnl IS NULL THEN max_drawdown
+                                ELSE MIN(max_drawdown,
+                                         cum_pnl + NEW.pnl - MAX(COALESCE(peak_pnl, cum_pnl + NEW.pnl), cum_pnl + NEW.pnl)) END,
+                            stale = CASE WHEN total = 0 OR NEW.entry_time >= max_entry_time THEN stale ELSE 1 END
+                        WHERE id = 1;
+                    END
+                ''')
+
+                # One-shot migration of text timestamps written by older versions
+                cursor.execute('''
+                    UPDATE trades SET entry_time = CAST(strftime('%s', entry_time) AS INTEGER)
+                    WHERE typeof(entry_time) = 'text' AND strftime('%s', entry_time) IS NOT NULL
+                ''')
+                migrated = cursor.rowcount > 0
+
+                # One-shot backfill for databases created before running_stats existed
+                cursor.execute('SELECT 1 FROM running_stats WHERE id = 1')
+                if migrated or added_cum_pnl or added_stale or cursor.fetchone() is None:
+                    self._rebuild_running_stats(conn)
+
                 # Create indices for better performance
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(token_symbol)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_entry_time ON trades(entry_time)')
-
-                conn.commit()
-                conn.close()
+                # Open trades are a small subset; a partial index avoids scanning the closed ones
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_trades_open ON trades(entry_time DESC) WHERE status = 'OPEN'"
+                )
+                cursor.execute('DROP INDEX IF EXISTS idx_trades_status')
 
                 logger.info("Database initialized successfully")
 
@@ -83,42 +309,12 @@ class DatabaseManager:
     def save_trade(self, trade_data):
         """Save a trade to the database"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
+            with self._transaction() as conn:
                 cursor = conn.cursor()
 
-                cursor.execute('''
-                    INSERT INTO trades (
-                        token_symbol, token_address, entry_price, exit_price,
-                        entry_time, exit_time, position_size, take_profit_price,
-                        stop_loss_price, take_profit_percentage, stop_loss_percentage,
-                        exit_type, pnl, pnl_percentage, status, message_id,
-                        message_text, channel
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    trade_data.get('token_symbol'),
-                    trade_data.get('token_address'),
-                    trade_data.get('entry_price'),
-                    trade_data.get('exit_price'),
-                    trade_data.get('entry_time'),
-                    trade_data.get('exit_time'),
-                    trade_data.get('position_size'),
-                    trade_data.get('take_profit_price'),
-                    trade_data.get('stop_loss_price'),
-                    trade_data.get('take_profit_percentage'),
-                    trade_data.get('stop_loss_percentage'),
-                    trade_data.get('exit_type'),
-                    trade_data.get('pnl'),
-                    trade_data.get('pnl_percentage'),
-                    trade_data.get('status', 'OPEN'),
-                    trade_data.get('message_id'),
-                    trade_data.get('message_text'),
-                    trade_data.get('channel'),
-                ))
-
-                conn.commit()
+                cursor.execute(_INSERT_TRADE_SQL, _trade_row(trade_data))
                 trade_id = cursor.lastrowid
-                conn.close()
+                self._rebuild_running_stats_if_stale(conn)
 
                 logger.info(f"Trade saved with ID: {trade_id}")
                 return trade_id
@@ -127,30 +323,161 @@ class DatabaseManager:
             logger.error(f"Error saving trade: {e}")
             return None
 
+    def save_trades_bulk(self, trades):
+        """Save several trades in a single transaction"""
+        if not trades:
+            return 0
+
+        try:
+            with self._transaction() as conn:
+                conn.executemany(_INSERT_TRADE_SQL, [_trade_row(trade) for trade in trades])
+                self._rebuild_running_stats_if_stale(conn)
+
+                logger.info(f"Saved {len(trades)} trades in one transaction")
+                return len(trades)
+
+        except Exception as e:
+            logger.error(f"Error saving trades in bulk: {e}")
+            return 0
+
     def get_all_trades(self):
         """Get all trades from the database"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                conn.row_factory = sqlite3.Row
+            with self._conn() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute('SELECT * FROM trades ORDER BY entry_time DESC')
                 trades = [dict(row) for row in cursor.fetchall()]
 
-                conn.close()
                 return trades
 
         except Exception as e:
             logger.error(f"Error fetching trades: {e}")
             return []
 
+    def get_trades_columns(self, cols=('id', 'pnl', 'entry_time')):
+        """Get selected trade columns as a dict of NumPy arrays, in insertion order"""
+        unknown = set(cols) - _TRADE_COLUMN_DTYPES.keys()
+        if unknown:
+            raise ValueError(f"Unknown trade columns: {sorted(unknown)}")
+
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(f"SELECT {', '.join(cols)} FROM trades ORDER BY id")
+                values = list(zip(*cursor.fetchall())) or [()] * len(cols)
+
+                return {
+                    col: np.array(column, dtype=_TRADE_COLUMN_DTYPES[col])
+                    for col, column in zip(cols, values)
+                }
+
+        except Exception as e:
+            logger.error(f"Error fetching trade columns: {e}")
+            return {col: np.empty(0, dtype=_TRADE_COLUMN_DTYPES[col]) for col in cols}
+
+    def get_trades_version(self):
+        """Get a cheap key that changes whenever the trades table changes"""
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
+
+                # Both are O(1): the trigger-maintained row count and a rowid seek
+                cursor.execute('''
+                    SELECT (SELECT total FROM running_stats WHERE id = 1),
+                           (SELECT COALESCE(MAX(id), 0) FROM trades)
+                ''')
+                count, max_id = cursor.fetchone()
+
+                return count, max_id, self._updates
+
+        except Exception as e:
+            logger.error(f"Error fetching trades version: {e}")
+            return None
+
+    def get_aggregate_stats(self):
+        """Get trade aggregates (counts, sums, time range, drawdown) kept up to date on insert"""
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('SELECT * FROM running_stats WHERE id = 1')
+                row = cursor.fetchone()
+
+                return dict(row) if row else None
+
+        except Exception as e:
+            logger.error(f"Error fetching aggregate stats: {e}")
+            return None
+
+    def _rebuild_running_stats(self, conn):
+        """Recompute the running_stats row and trades.cum_pnl from the full trade history"""
+        conn.execute('''
+            UPDATE trades SET cum_pnl = running.cum_pnl
+            FROM (SELECT id, SUM(COALESCE(pnl, 0)) OVER (ORDER BY entry_time, id) AS cum_pnl FROM trades) AS running
+            WHERE trades.id = running.id
+        ''')
+
+        stats = dict(conn.execute(_AGGREGATE_SQL).fetchone())
+
+        data = np.array(
+            conn.execute('SELECT pnl, pnl_percentage FROM trades ORDER BY entry_time, id').fetchall(),
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        cum_pnl, peak_pnl, max_drawdown, sum_ret, sum_ret_sq = trade_stats_kernel(
+            np.ascontiguousarray(data[:, 0]), np.ascontiguousarray(data[:, 1])
+        )
+        stats.update({
+            'sum_ret': float(sum_ret),
+            'sum_ret_sq': float(sum_ret_sq),
+            'cum_pnl': float(cum_pnl),
+            'peak_pnl': None if np.isnan(peak_pnl) else float(peak_pnl),
+            'max_drawdown': float(max_drawdown),
+            'stale': 0,
+        })
+
+        columns = ', '.join(stats)
+        placeholders = ', '.join(f':{key}' for key in stats)
+        conn.execute(f'INSERT OR REPLACE INTO running_stats (id, {columns}) VALUES (1, {placeholders})', stats)
+
+    def _rebuild_running_stats_if_stale(self, conn):
+        """Rebuild running_stats if an insert arrived out of entry_time order"""
+        row = conn.execute('SELECT stale FROM running_stats WHERE id = 1').fetchone()
+        if row is not None and row[0]:
+            self._rebuild_running_stats(conn)
+
+    def get_pnl_array(self):
+        """Get closed-trade PnL, cumulative PnL and entry time as NumPy arrays in entry_time order"""
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    SELECT pnl, cum_pnl, CASE WHEN typeof(entry_time) = 'integer' THEN entry_time END
+                    FROM trades
+                    WHERE status = 'CLOSED'
+                    ORDER BY entry_time, id
+                ''')
+                data = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 3)
+
+                # NULLs arrive as NaN; entry times that are not epoch seconds become NaT
+                epoch = data[:, 2]
+                entry_time = np.full(len(epoch), np.datetime64('NaT'), dtype='datetime64[s]')
+                valid = ~np.isnan(epoch)
+                entry_time[valid] = epoch[valid].astype(np.int64)
+
+                return data[:, 0], data[:, 1], entry_time
+
+        except Exception as e:
+            logger.error(f"Error fetching PnL arrays: {e}")
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty, np.empty(0, dtype='datetime64[s]')
+
     def get_recent_trades(self, limit=20):
         """Get recent trades"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                conn.row_factory = sqlite3.Row
+            with self._conn() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -159,7 +486,6 @@ class DatabaseManager:
                 )
                 trades = [dict(row) for row in cursor.fetchall()]
 
-                conn.close()
                 return trades
 
         except Exception as e:
@@ -169,26 +495,48 @@ class DatabaseManager:
     def get_open_trades(self):
         """Get all open trades"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                conn.row_factory = sqlite3.Row
+            with self._conn() as conn:
                 cursor = conn.cursor()
 
-                cursor.execute('SELECT * FROM trades WHERE status = "OPEN"')
+                cursor.execute("SELECT * FROM trades WHERE status = 'OPEN' ORDER BY entry_time DESC")
                 trades = [dict(row) for row in cursor.fetchall()]
 
-                conn.close()
                 return trades
 
         except Exception as e:
             logger.error(f"Error fetching open trades: {e}")
             return []
 
+    def count_all_trades(self):
+        """Get the number of trades"""
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('SELECT COUNT(*) FROM trades')
+                return cursor.fetchone()[0]
+
+        except Exception as e:
+            logger.error(f"Error counting trades: {e}")
+            return 0
+
+    def count_open_trades(self):
+        """Get the number of open trades"""
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute("SELECT COUNT(*) FROM trades WHERE status = 'OPEN'")
+                return cursor.fetchone()[0]
+
+        except Exception as e:
+            logger.error(f"Error counting open trades: {e}")
+            return 0
+
     def update_trade(self, trade_id, update_data):
         """Update a trade"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
+            with self._transaction() as conn:
                 cursor = conn.cursor()
 
                 # Build update query dynamically
@@ -196,17 +544,21 @@ class DatabaseManager:
                 values = []
                 for key, value in update_data.items():
                     fields.append(f"{key} = ?")
-                    values.append(value)
+                    values.append(_to_epoch(value) if key == 'entry_time' else value)
 
                 values.append(trade_id)
                 query = f"UPDATE trades SET {', '.join(fields)} WHERE id = ?"
 
                 cursor.execute(query, values)
-                conn.commit()
-                conn.close()
+                if _RUNNING_STATS_INPUTS & update_data.keys():
+                    self._rebuild_running_stats(conn)
 
-                logger.info(f"Trade {trade_id} updated")
-                return True
+            # Bump the version only after COMMIT, so no reader can pair the new
+            # version with the pre-update snapshot and cache that result
+            self._updates = next(self._update_seq)
+
+            logger.info(f"Trade {trade_id} updated")
+            return True
 
         except Exception as e:
             logger.error(f"Error updating trade {trade_id}: {e}")
@@ -215,8 +567,7 @@ class DatabaseManager:
     def save_daily_statistics(self, stats):
         """Save daily statistics"""
         try:
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
+            with self._transaction() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute('''
@@ -233,8 +584,6 @@ class DatabaseManager:
                     stats.get('win_rate'),
                 ))
 
-                conn.commit()
-                conn.close()
 
                 logger.info("Daily statistics saved")
 
@@ -242,5 +591,10 @@ class DatabaseManager:
             logger.error(f"Error saving statistics: {e}")
 
     def close(self):
-        """Close database connection"""
+        """Close idle pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
         logger.info("Database connection closed")
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Numeric kernels for full-history trade statistics
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Optional: fall back to the NumPy implementation
+    njit = None
+
+
+def _trade_stats_loop(pnl, pnl_pct):
+    """Single fused pass over the trade history (compiled with Numba)"""
+    cum_pnl = 0.0
+    peak_pnl = np.nan
+    max_drawdown = 0.0
+    sum_ret = 0.0
+    sum_ret_sq = 0.0
+
+    for i in range(pnl.shape[0]):
+        value = pnl[i]
+        if not np.isnan(value):
+            cum_pnl += value
+            if np.isnan(peak_pnl) or cum_pnl > peak_pnl:
+                peak_pnl = cum_pnl
+            if cum_pnl - peak_pnl < max_drawdown:
+                max_drawdown = cum_pnl - peak_pnl
+
+        ret = pnl_pct[i]
+        if not np.isnan(ret):
+            sum_ret += ret
+            sum_ret_sq += ret * ret
+
+    return cum_pnl, peak_pnl, max_drawdown, sum_ret, sum_ret_sq
+
+
+def _trade_stats_numpy(pnl, pnl_pct):
+    """Same results as _trade_stats_loop, using NumPy intermediates"""
+    pnl = pnl[~np.isnan(pnl)]
+    pnl_pct = pnl_pct[~np.isnan(pnl_pct)]
+
+    if pnl.size:
+        cum_pnl = np.cumsum(pnl)
+        peak_pnl = np.maximum.accumulate(cum_pnl)
+        totals = float(cum_pnl[-1]), float(peak_pnl[-1]), float((cum_pnl - peak_pnl).min())
+    else:
+        totals = 0.0, np.nan, 0.0
+
+    return (*totals, float(pnl_pct.sum()), float(np.dot(pnl_pct, pnl_pct)))
+
+
+# Returns (cum_pnl, peak_pnl, max_drawdown, sum_ret, sum_ret_sq); NaN inputs are
+# skipped and peak_pnl is NaN when there is no realized PnL
+trade_stats_kernel = njit(cache=True)(_trade_stats_loop) if njit else _trade_stats_numpy
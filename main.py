@@ -11,6 +11,8 @@ import signal
 import threading
 from pathlib import Path
 
+from waitress import serve
+
 from telegram_monitor import TelegramMonitor
 from backtester import Backtester
 from database import DatabaseManager
@@ -67,7 +69,8 @@ class TradingBacktestSystem:
     def run_web_server(self):
         """Run Flask web server"""
         app = create_app(self.db)
-        app.run(host='0.0.0.0', port=self.config.WEB_PORT, debug=False)
+        # Production WSGI server with a fixed worker-thread pool; app.run is for development only
+        serve(app, host='0.0.0.0', port=self.config.WEB_PORT, threads=self.config.WEB_THREADS)
 
     async def shutdown(self):
         """Graceful shutdown"""
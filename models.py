@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+import numpy as np
+
 
 @dataclass
 class Trade:
@@ -59,37 +61,24 @@ class BacktestResult:
             return
 
         self.total_trades = len(trades)
-        winning_trades = [t for t in trades if t.profit_loss and t.profit_loss > 0]
-        losing_trades = [t for t in trades if t.profit_loss and t.profit_loss < 0]
+        pnls = np.array([t.profit_loss for t in trades if t.profit_loss is not None], dtype=np.float64)
+        winners = pnls[pnls > 0]
+        losers = pnls[pnls < 0]
 
-        self.winning_trades = len(winning_trades)
-        self.losing_trades = len(losing_trades)
+        self.winning_trades = len(winners)
+        self.losing_trades = len(losers)
 
         if self.total_trades > 0:
             self.win_rate = (self.winning_trades / self.total_trades) * 100
 
-        self.total_profit_loss = sum(t.profit_loss for t in trades if t.profit_loss)
+        self.total_profit_loss = float(pnls.sum())
 
-        if winning_trades:
-            self.average_win = sum(t.profit_loss for t in winning_trades) / len(winning_trades)
-        if losing_trades:
-            self.average_loss = sum(t.profit_loss for t in losing_trades) / len(losing_trades)
+        if winners.size:
+            self.average_win = float(winners.mean())
+        if losers.size:
+            self.average_loss = float(losers.mean())
 
         # Calculate max drawdown
-        cumulative_pnl = []
-        running_total = 0
-        for trade in trades:
-            if trade.profit_loss:
-                running_total += trade.profit_loss
-                cumulative_pnl.append(running_total)
-
-        if cumulative_pnl:
-            peak = cumulative_pnl[0]
-            max_dd = 0
-            for value in cumulative_pnl:
-                if value > peak:
-                    peak = value
-                drawdown = peak - value
-                if drawdown > max_dd:
-                    max_dd = drawdown
-            self.max_drawdown = max_dd
\ No newline at end of file
+        if pnls.size:
+            cumulative_pnl = pnls.cumsum()
+            self.max_drawdown = float((np.maximum.accumulate(cumulative_pnl) - cumulative_pnl).max())
@@ -4,11 +4,19 @@ Telegram channel monitoring module
 
 import asyncio
 import logging
-import re
+from collections import OrderedDict
 from datetime import datetime
 from telethon import TelegramClient, events
 from telethon.errors import SessionPasswordNeededError
 import json
+import numpy as np
+
+import calc_vec
+
+try:
+    import hyperscan
+except ImportError:  # Optional: fall back to the precompiled `re` alternations
+    hyperscan = None
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +24,11 @@ class TelegramMonitor:
     def __init__(self, config, db_manager):
         self.config = config
         self.db = db_manager
+        self._rng = np.random.default_rng()
         self.client = None
         self.running = False
-        self.processed_messages = set()
+        self.processed_messages = OrderedDict()  # Bounded LRU of seen message ids
+        self.scanner = self._build_scanner()
 
     async def start_monitoring(self):
         """Start monitoring the Telegram channel"""
@@ -42,11 +52,23 @@ class TelegramMonitor:
             async def handle_new_message(event):
                 await self.process_message(event.message)
 
-            # Process historical messages (last 100)
+            # Process historical messages (last 100): parse all of them, then
+            # simulate and save the resulting trades as one batch
             logger.info("Processing historical messages...")
+            pending = []
             async for message in self.client.iter_messages(channel, limit=100):
-                if message.id not in self.processed_messages:
-                    await self.process_message(message)
+                if message.id in self.processed_messages:
+                    continue
+                self._mark_processed(message.id)
+
+                trade_data = self.parse_message(message)
+                if trade_data:
+                    pending.append(trade_data)
+
+            # iter_messages yields newest first; store the backfill oldest first
+            pending.sort(key=lambda trade: trade['entry_time'])
+            pending = self.simulate_trades(pending)
+            self.db.save_trades_bulk(pending)
 
             logger.info("Starting real-time monitoring...")
             self.running = True
@@ -68,33 +90,52 @@ class TelegramMonitor:
             if message.id in self.processed_messages:
                 return
 
-            self.processed_messages.add(message.id)
+            self._mark_processed(message.id)
+
+            trade_data = self.parse_message(message)
+            if trade_data:
+                # Simulate the trade
+                self.simulate_trade(trade_data)
+                self.db.save_trade(trade_data)
+
+        except Exception as e:
+            logger.error(f"Error processing message {message.id}: {e}")
 
+    def parse_message(self, message):
+        """Build an unsimulated trade from a message, or None if it has no signal"""
+        try:
             # Extract token information
             token_info = self.extract_token_info(message.text)
 
-            if token_info:
-                logger.info(f"New token detected: {token_info}")
-
-                # Create a backtest trade
-                trade_data = {
-                    'token_symbol': token_info.get('symbol', 'UNKNOWN'),
-                    'token_address': token_info.get('address', ''),
-                    'entry_price': token_info.get('price', 0.001),  # Default price if not found
-                    'entry_time': message.date,
-                    'message_id': message.id,
-                    'message_text': message.text[:500],  # Store first 500 chars
-                    'channel': self.config.CHANNEL_USERNAME,
-                    'position_size': self.config.POSITION_SIZE,
-                    'take_profit_percentage': self.config.TAKE_PROFIT_PERCENTAGE,
-                    'stop_loss_percentage': self.config.STOP_LOSS_PERCENTAGE,
-                }
+            if not token_info:
+                return None
 
-                # Simulate the trade
-                self.simulate_trade(trade_data)
+            logger.info(f"New token detected: {token_info}")
+
+            # Create a backtest trade
+            return {
+                'token_symbol': token_info.get('symbol', 'UNKNOWN'),
+                'token_address': token_info.get('address', ''),
+                'entry_price': token_info.get('price', 0.001),  # Default price if not found
+                'entry_time': message.date,
+                'message_id': message.id,
+                'message_text': message.text[:500],  # Store first 500 chars
+                'channel': self.config.CHANNEL_USERNAME,
+                'position_size': self.config.POSITION_SIZE,
+                'take_profit_percentage': self.config.TAKE_PROFIT_PERCENTAGE,
+                'stop_loss_percentage': self.config.STOP_LOSS_PERCENTAGE,
+            }
 
         except Exception as e:
-            logger.error(f"Error processing message {message.id}: {e}")
+            logger.error(f"Error parsing message {message.id}: {e}")
+            return None
+
+    def _mark_processed(self, message_id):
+        """Remember a message id, evicting the oldest once the cap is reached"""
+        self.processed_messages[message_id] = None
+        self.processed_messages.move_to_end(message_id)
+        if len(self.processed_messages) > self.config.MAX_PROCESSED_MESSAGES:
+            self.processed_messages.popitem(last=False)
 
     def extract_token_info(self, text):
         """Extract token information from message text"""
@@ -102,29 +143,27 @@ class TelegramMonitor:
             return None
 
         token_info = {}
+        matched = self._scan(text)
 
         # Look for token symbols
-        for pattern in self.config.TOKEN_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                token_info['symbol'] = match.group(1).upper()
-                break
+        for symbol in self._search_patterns(self.config.TOKEN_PATTERNS_UNION, self.config.TOKEN_PATTERNS_RE,
+                                            text, matched):
+            token_info['symbol'] = symbol.upper()
+            break
 
         # Look for contract addresses
-        address_pattern = r'[A-Za-z0-9]{32,44}'
-        address_match = re.search(address_pattern, text)
+        address_match = self.config.ADDRESS_PATTERN_RE.search(text)
         if address_match:
             token_info['address'] = address_match.group(0)
 
         # Look for price information
-        for pattern in self.config.PRICE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    token_info['price'] = float(match.group(1))
-                    break
-                except:
-                    pass
+        for price in self._search_patterns(self.config.PRICE_PATTERNS_UNION, self.config.PRICE_PATTERNS_RE,
+                                           text, matched, offset=len(self.config.TOKEN_PATTERNS)):
+            try:
+                token_info['price'] = float(price)
+                break
+            except:
+                pass
 
         # If no price found, use a default
         if 'price' not in token_info and 'symbol' in token_info:
@@ -132,6 +171,72 @@ class TelegramMonitor:
 
         return token_info if 'symbol' in token_info else None
 
+    def _build_scanner(self):
+        """Compile token and price patterns into one Hyperscan database, if available"""
+        if hyperscan is None:
+            return None
+
+        expressions = self.config.TOKEN_PATTERNS + self.config.PRICE_PATTERNS
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[p.encode() for p in expressions],
+                ids=list(range(len(expressions))),
+                flags=[flags] * len(expressions),
+            )
+            return db
+        except Exception as e:
+            logger.warning(f"Hyperscan unavailable, using re patterns: {e}")
+            return None
+
+    def _scan(self, text):
+        """Return the ids of patterns that match text, or None without Hyperscan"""
+        if self.scanner is None:
+            return None
+
+        matched = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+
+        self.scanner.scan(text.encode(), match_event_handler=on_match)
+        return matched
+
+    @staticmethod
+    def _search_patterns(union, patterns, text, matched=None, offset=0):
+        """Yield each pattern's first captured group, in pattern priority order.
+
+        Hyperscan cannot report capture groups, so when it ran, matched holds
+        the ids of the patterns it found (patterns[i] has id offset + i) and
+        only those are searched with re.
+
+        Otherwise the union scans the text once. If its winning alternative is
+        the first pattern, that is also the first pattern's own leftmost match;
+        otherwise the individual patterns are searched in order.
+        """
+        if matched is not None:
+            for i, pattern in enumerate(patterns):
+                if offset + i in matched:
+                    match = pattern.search(text)
+                    if match:
+                        yield match.group(1)
+            return
+
+        match = union.search(text)
+        if match is None:
+            return
+
+        start = 0
+        if match.lastindex == 1:
+            yield match.group(1)
+            start = 1
+
+        for pattern in patterns[start:]:
+            match = pattern.search(text)
+            if match:
+                yield match.group(1)
+
     def simulate_trade(self, trade_data):
         """Simulate a trade with take profit and stop loss"""
         entry_price = trade_data['entry_price']
@@ -140,10 +245,7 @@ class TelegramMonitor:
 
         # For backtesting, randomly determine if TP or SL was hit
         # In real scenario, you would check actual price movement
-        import random
-
-        # Simulate 60% win rate for backtesting
-        if random.random() < 0.6:
+        if self._rng.random() < self.config.SIMULATED_WIN_RATE:
             # Take profit hit
             exit_price = take_profit_price
             exit_type = 'TAKE_PROFIT'
@@ -165,10 +267,49 @@ class TelegramMonitor:
             'status': 'CLOSED',
         })
 
-        # Save to database
-        self.db.save_trade(trade_data)
         logger.info(f"Trade completed: {trade_data['token_symbol']} - {exit_type} - PnL: ${pnl:.2f}")
 
+    def simulate_trades(self, trades):
+        """Simulate a batch of trades with one vectorized draw and return the simulated ones"""
+        # A non-positive entry price has no meaningful return; simulate_trade
+        # fails on it too, so such trades are dropped rather than saved with NaN PnL
+        valid = []
+        for trade_data in trades:
+            if trade_data['entry_price'] > 0:
+                valid.append(trade_data)
+            else:
+                logger.error(f"Skipping message {trade_data['message_id']}: invalid entry price {trade_data['entry_price']}")
+        trades = valid
+        if not trades:
+            return trades
+
+        entries = np.fromiter((t['entry_price'] for t in trades), dtype=np.float64, count=len(trades))
+        sizes = np.fromiter((t['position_size'] for t in trades), dtype=np.float64, count=len(trades))
+        results = calc_vec.simulate_exits(
+            entries, sizes,
+            self.config.TAKE_PROFIT_PERCENTAGE, self.config.STOP_LOSS_PERCENTAGE,
+            self.config.SIMULATED_WIN_RATE, self._rng,
+        )
+
+        exit_time = datetime.now()
+        for trade_data, (tp_price, sl_price, exit_price, hit_tp, pnl, pnl_pct) in zip(trades, results.tolist()):
+            trade_data.update({
+                'exit_price': exit_price,
+                'exit_time': exit_time,
+                'exit_type': 'TAKE_PROFIT' if hit_tp else 'STOP_LOSS',
+                'take_profit_price': tp_price,
+                'stop_loss_price': sl_price,
+                'pnl': pnl,
+                'pnl_percentage': pnl_pct,
+                'status': 'CLOSED',
+            })
+
+        logger.info(
+            f"Simulated {len(trades)} trades: {int(results['hit_take_profit'].sum())} take profit, "
+            f"total PnL: ${results['pnl'].sum():.2f}"
+        )
+        return trades
+
     async def stop(self):
         """Stop monitoring"""
         self.running = False
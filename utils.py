@@ -1,91 +1,303 @@
+import asyncio
+import orjson
 import requests
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import time
 import logging
+import random
 import re
-from datetime import datetime
-from typing import Optional, Dict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 from models import PriceData
-import config
+from config import Config as config
+
+_BASE58_RE = re.compile(r'^[A-HJ-NP-Z1-9]{32,44}\Z')
+_SYMBOL_RE = re.compile(r'[^A-Z0-9]')
+
+# Client errors that will not succeed on retry (429 is retried)
+_TERMINAL_STATUSES = frozenset({400, 401, 403, 404})
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay seconds or HTTP date), or None if absent/invalid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter"""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # Tokens added per second
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, n: float = 1) -> float:
+        """Take n tokens and return how many seconds the caller must wait first"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+
+            # Going negative reserves the tokens, so concurrent callers queue
+            # up behind each other instead of all waking at once
+            self.tokens -= n
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.refill_rate
+
+    def penalize(self, seconds: float):
+        """Hold every caller back for at least seconds, e.g. a server's Retry-After"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            self.tokens = min(self.tokens, -seconds * self.refill_rate)
 
 
 class PriceProvider:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.last_request_time = {}
-        self.rate_limit_delay = 1  # Seconds between requests
+        self.bucket = TokenBucket(config.PRICE_API_BURST, config.PRICE_API_RATE)  # Shared across all tokens
+
+        # One pooled session so repeat calls reuse TCP/TLS connections. The adapter
+        # only retries connection errors; HTTP statuses are handled by get_token_price,
+        # and Retry-After by the shared bucket (urllib3 would otherwise sleep on it
+        # and retry outside the bucket).
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status=0,
+            status_forcelist=(),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", "User-Agent": "price-bot/1.0"})
+
+        # Recently fetched prices, shared by every thread using this provider
+        self._price_cache = TTLCache(maxsize=config.PRICE_CACHE_SIZE, ttl=config.PRICE_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+
+        # Response validators per request URL: url -> (etag, last_modified, prices),
+        # so an expired price can be revalidated with a bodiless 304
+        self._validators = OrderedDict()
+
+        # Worker threads for batched fetches; they share the session's keep-alive pool
+        self._executor = ThreadPoolExecutor(max_workers=config.PRICE_FETCH_WORKERS, thread_name_prefix='price')
 
     def get_token_price(self, token_address: str, retries: int = 3) -> Optional[float]:
         """Get current price for a token address"""
+        with self._cache_lock:
+            price = self._price_cache.get(token_address)
+        if price is not None:
+            return price
+
         for attempt in range(retries):
             try:
                 # Try DexScreener first (better for new tokens)
-                price = self._get_price_dexscreener(token_address)
+                price, status, retry_after = self._get_price_dexscreener(token_address)
                 if price:
+                    with self._cache_lock:
+                        self._price_cache[token_address] = price
                     return price
 
+                if status in _TERMINAL_STATUSES:
+                    self.logger.warning(f"Could not get price for {token_address}: HTTP {status}")
+                    return None
+
                 # Fallback to other sources if needed
                 self.logger.warning(f"Could not get price for {token_address}, attempt {attempt + 1}")
-                time.sleep(2 ** attempt)  # Exponential backoff
+                if attempt + 1 < retries and retry_after is None:
+                    # Full-jitter exponential backoff, so concurrent callers spread out.
+                    # A Retry-After wait is already enforced by the shared bucket.
+                    time.sleep(random.uniform(0, min(config.PRICE_RETRY_CAP, config.PRICE_RETRY_BASE * 2 ** attempt)))
 
             except Exception as e:
                 self.logger.error(f"Error getting price for {token_address}: {e}")
 
         return None
 
-    def _get_price_dexscreener(self, token_address: str) -> Optional[float]:
-        """Get price from DexScreener API"""
+    def get_prices(self, token_addresses: List[str]) -> Dict[str, Optional[float]]:
+        """Fetch prices for many tokens, keyed by token address (None when unavailable)"""
+        prices = self.get_prices_bulk(token_addresses)
+        return {address: prices.get(address) for address in token_addresses}
+
+    async def get_many_prices(self, token_addresses: List[str]) -> Dict[str, Optional[float]]:
+        """Async form of get_prices; batches run on the provider's worker pool"""
+        prices, missing = self._cached_prices(token_addresses)
+        loop = asyncio.get_running_loop()
+        batches = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, self._fetch_batch, batch)
+            for batch in self._batches(missing)
+        ))
+        for fetched in batches:
+            prices.update(fetched)
+        return {address: prices.get(address) for address in token_addresses}
+
+    def get_prices_bulk(self, token_addresses: List[str]) -> Dict[str, float]:
+        """Get current prices for many tokens, one request per batch of addresses"""
+        prices, missing = self._cached_prices(token_addresses)
+        # Batches are fetched concurrently on the worker pool
+        for fetched in self._executor.map(self._fetch_batch, self._batches(missing)):
+            prices.update(fetched)
+        return prices
+
+    def _cached_prices(self, token_addresses: List[str]) -> Tuple[Dict[str, float], List[str]]:
+        """Split token addresses into cached prices and the distinct addresses still to fetch"""
+        prices = {}
+        missing = []
+        with self._cache_lock:
+            for token_address in dict.fromkeys(token_addresses):
+                price = self._price_cache.get(token_address)
+                if price is not None:
+                    prices[token_address] = price
+                else:
+                    missing.append(token_address)
+        return prices, missing
+
+    @staticmethod
+    def _batches(token_addresses: List[str]) -> List[List[str]]:
+        """Chunk token addresses into DexScreener-sized batches"""
+        batch_size = config.DEXSCREENER_BATCH_SIZE
+        return [token_addresses[i:i + batch_size] for i in range(0, len(token_addresses), batch_size)]
+
+    def _fetch_batch(self, token_addresses: List[str]) -> Dict[str, float]:
+        """Fetch one batch of prices and cache what was found"""
+        fetched, _, _ = self._get_prices_dexscreener(token_addresses)
+        with self._cache_lock:
+            self._price_cache.update(fetched)
+        return fetched
+
+    def _get_price_dexscreener(self, token_address: str) -> Tuple[Optional[float], Optional[int], Optional[float]]:
+        """Get price from DexScreener API, with the HTTP status and any Retry-After seconds"""
+        prices, status, retry_after = self._get_prices_dexscreener([token_address])
+        return prices.get(token_address), status, retry_after
+
+    def _get_prices_dexscreener(self, token_addresses: List[str]) -> Tuple[Dict[str, float], Optional[int], Optional[float]]:
+        """Get prices for up to DEXSCREENER_BATCH_SIZE tokens in one DexScreener request
+
+        Also returns the HTTP status (None if the request failed) and, for a
+        rate-limited response, the server's Retry-After in seconds.
+        """
+        prices = {}
         try:
             # Rate limiting
-            current_time = time.time()
-            if token_address in self.last_request_time:
-                time_diff = current_time - self.last_request_time[token_address]
-                if time_diff < self.rate_limit_delay:
-                    time.sleep(self.rate_limit_delay - time_diff)
+            time.sleep(self.bucket.acquire())
+
+            url = f"{config.DEXSCREENER_API_URL}/tokens/{','.join(token_addresses)}"
+            with self._cache_lock:
+                validator = self._validators.get(url)
 
-            url = f"{config.DEXSCREENER_API_URL}/tokens/{token_address}"
-            response = requests.get(url, timeout=10)
+            headers = {}
+            if validator:
+                etag, last_modified, _ = validator
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
 
-            self.last_request_time[token_address] = time.time()
+            response = self.session.get(url, headers=headers, timeout=(3, 10))
+
+            if response.status_code == 304 and validator:
+                # Unchanged since the last fetch: reuse those prices, no body to parse
+                with self._cache_lock:
+                    if url in self._validators:
+                        self._validators.move_to_end(url)
+                return validator[2], response.status_code, None
 
             if response.status_code == 200:
-                data = response.json()
-                if 'pairs' in data and data['pairs']:
-                    # Get the pair with highest liquidity
-                    pairs = data['pairs']
-                    best_pair = max(pairs, key=lambda x: float(x.get('liquidity', {}).get('usd', 0)))
-                    return float(best_pair['priceUsd'])
+                data = orjson.loads(response.content)
+                # Use the pair with highest liquidity for each requested token
+                best_liquidity = {}
+                for pair in data.get('pairs') or ():
+                    price = pair.get('priceUsd')
+                    base = pair.get('baseToken')
+                    if not price or not base:
+                        continue
+                    token_address = base.get('address')
+                    liq = pair.get('liquidity')
+                    try:
+                        liquidity = float(liq['usd']) if liq and 'usd' in liq else 0.0
+                        price = float(price)
+                    except (TypeError, ValueError):
+                        continue  # Malformed pair: skip it, not the whole batch
+                    if liquidity > best_liquidity.get(token_address, -1.0):
+                        best_liquidity[token_address] = liquidity
+                        prices[token_address] = price
+
+                prices = {address: prices[address] for address in token_addresses if address in prices}
+                self._store_validator(url, response, prices)
+                return prices, response.status_code, None
+
+            if response.status_code == 429:
+                retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    # Stop every thread sharing the bucket, not just this caller
+                    self.bucket.penalize(retry_after)
+                return {}, response.status_code, retry_after
+
+            return {}, response.status_code, None
 
         except Exception as e:
             self.logger.error(f"DexScreener API error: {e}")
 
-        return None
+        return {}, None, None
+
+    def _store_validator(self, url: str, response, prices: Dict[str, float]):
+        """Remember a response's validators, evicting the oldest once the cap is reached"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self._cache_lock:
+            if not etag and not last_modified:
+                self._validators.pop(url, None)
+                return
+            self._validators[url] = (etag, last_modified, prices)
+            self._validators.move_to_end(url)
+            if len(self._validators) > config.PRICE_VALIDATOR_CACHE_SIZE:
+                self._validators.popitem(last=False)
 
 
 class TradeCalculator:
     @staticmethod
     def calculate_profit_loss(entry_price: float, exit_price: float, position_size: float) -> tuple:
         """Calculate profit/loss in USD and percentage"""
-        shares = position_size / entry_price
-        exit_value = shares * exit_price
-        profit_loss_usd = exit_value - position_size
-        profit_loss_percent = ((exit_price - entry_price) / entry_price) * 100
-
-        return profit_loss_usd, profit_loss_percent
+        ret = exit_price / entry_price - 1
+        return position_size * ret, ret * 100
 
     @staticmethod
     def calculate_position_size(entry_price: float, max_position_size: float = config.POSITION_SIZE) -> float:
         """Calculate position size based on available capital"""
-        return min(max_position_size, max_position_size)
+        return max_position_size
 
     @staticmethod
     def get_take_profit_price(entry_price: float) -> float:
         """Calculate take profit price"""
-        return entry_price * (1 + config.TAKE_PROFIT_PERCENT / 100)
+        return entry_price * (1 + config.TAKE_PROFIT_PERCENTAGE / 100)
 
     @staticmethod
     def get_stop_loss_price(entry_price: float) -> float:
         """Calculate stop loss price"""
-        return entry_price * (1 - config.STOP_LOSS_PERCENT / 100)
+        return entry_price * (1 - config.STOP_LOSS_PERCENTAGE / 100)
 
 
 class Logger:
@@ -111,10 +323,8 @@ class DataValidator:
     @staticmethod
     def validate_token_address(address: str) -> bool:
         """Validate Solana token address format"""
-        if not address or len(address) < 32 or len(address) > 44:
-            return False
-        # Basic base58 validation
-        return bool(re.match(r'^[A-HJ-NP-Z1-9]+$', address))
+        # Basic base58 validation, length bounds included
+        return bool(address and _BASE58_RE.match(address))
 
     @staticmethod
     def validate_price(price: float) -> bool:
@@ -124,13 +334,23 @@ class DataValidator:
     @staticmethod
     def sanitize_symbol(symbol: str) -> str:
         """Clean and validate token symbol"""
-        if not symbol:
-            return "UNKNOWN"
-        return re.sub(r'[^A-Z0-9]', '', symbol.upper())[:10]
+        return _SYMBOL_RE.sub('', symbol.upper())[:10] if symbol else "UNKNOWN"
 
 
 def format_currency(amount: float, decimals: int = 2) -> str:
     """Format currency with proper decimals"""
+    # -0.0 equals 0.0 and would share its cache entry, so zeros skip the cache
+    if amount == 0:
+        return _currency_text(amount, decimals)
+    return _format_currency(amount, decimals)
+
+
+@lru_cache(maxsize=4096)
+def _format_currency(amount: float, decimals: int) -> str:
+    return _currency_text(amount, decimals)
+
+
+def _currency_text(amount: float, decimals: int) -> str:
     if abs(amount) < 0.01:
         return f"${amount:.6f}"
     return f"${amount:,.{decimals}f}"
@@ -138,6 +358,17 @@ def format_currency(amount: float, decimals: int = 2) -> str:
 
 def format_percentage(percentage: float, decimals: int = 2) -> str:
     """Format percentage with proper sign and decimals"""
+    if percentage == 0:
+        return _percentage_text(percentage, decimals)
+    return _format_percentage(percentage, decimals)
+
+
+@lru_cache(maxsize=4096)
+def _format_percentage(percentage: float, decimals: int) -> str:
+    return _percentage_text(percentage, decimals)
+
+
+def _percentage_text(percentage: float, decimals: int) -> str:
     sign = "+" if percentage > 0 else ""
     return f"{sign}{percentage:.{decimals}f}%"
 
@@ -147,14 +378,13 @@ def calculate_time_diff(start_time: datetime, end_time: datetime = None) -> str:
     if end_time is None:
         end_time = datetime.now()
 
-    diff = end_time - start_time
-    days = diff.days
-    hours, remainder = divmod(diff.seconds, 3600)
-    minutes, _ = divmod(remainder, 60)
+    total = int((end_time - start_time).total_seconds())
+    days, remainder = divmod(total, 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes = remainder // 60
 
     if days > 0:
         return f"{days}d {hours}h {minutes}m"
-    elif hours > 0:
+    if hours > 0:
         return f"{hours}h {minutes}m"
-    else:
-        return f"{minutes}m"
\ No newline at end of file
+    return f"{minutes}m"
\ No newline at end of file
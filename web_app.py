@@ -2,23 +2,65 @@
 Flask web application for viewing backtest statistics
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, request
 from flask_cors import CORS
+from flask_compress import Compress
 import logging
-from datetime import datetime
+import threading
+import orjson
+from cachetools import TTLCache
+from datetime import datetime, timezone
 from backtester import Backtester
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+
+def _json(obj, status=200):
+    """JSON response encoded by orjson, which serializes NumPy arrays natively"""
+    return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype='application/json')
+
+
 def create_app(db_manager):
     app = Flask(__name__)
     CORS(app)
 
+    # Compress JSON payloads (trade lists and chart series can be hundreds of KB)
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_LEVEL'] = 5
+    app.config['COMPRESS_BR_LEVEL'] = 4
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    Compress(app)
+
     # Create backtester instance
     config = Config()
     backtester = Backtester(config, db_manager)
 
+    # Dashboard aggregates are shared by every polling client for a few seconds
+    api_cache = TTLCache(maxsize=4, ttl=config.API_CACHE_TTL)
+    api_cache_lock = threading.Lock()  # Guards api_cache itself, never held while computing
+    compute_locks = {}  # Per key, so a slow recompute only blocks requests for that key
+
+    def cached_json(key, compute):
+        """JSON response for compute(), recomputed at most once per API_CACHE_TTL"""
+        with api_cache_lock:
+            result = api_cache.get(key)
+
+        if result is None:
+            with compute_locks.setdefault(key, threading.Lock()):
+                # Another request may have filled the entry while this one waited
+                with api_cache_lock:
+                    result = api_cache.get(key)
+                if result is None:
+                    result = compute()
+                    with api_cache_lock:
+                        api_cache[key] = result
+
+        response = _json(result)
+        response.headers['Cache-Control'] = f'max-age={config.API_CACHE_TTL}'
+        return response
+
     @app.route('/')
     def index():
         """Main dashboard page"""
@@ -28,11 +70,10 @@ def create_app(db_manager):
     def get_statistics():
         """Get trading statistics"""
         try:
-            stats = backtester.calculate_statistics()
-            return jsonify(stats)
+            return cached_json('statistics', backtester.calculate_statistics)
         except Exception as e:
             logger.error(f"Error getting statistics: {e}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
 
     @app.route('/api/trades')
     def get_trades():
@@ -43,61 +84,57 @@ def create_app(db_manager):
 
             # Format dates for display
             for trade in trades:
-                if trade.get('entry_time'):
+                if isinstance(trade.get('entry_time'), int):
+                    # Stored as Unix seconds
+                    entry_time = datetime.fromtimestamp(trade['entry_time'], timezone.utc)
+                    trade['entry_time'] = entry_time.strftime('%Y-%m-%d %H:%M:%S')
+                elif trade.get('entry_time'):
                     trade['entry_time'] = str(trade['entry_time'])[:19]
                 if trade.get('exit_time'):
                     trade['exit_time'] = str(trade['exit_time'])[:19]
 
-                # Round numerical values
-                for key in ['entry_price', 'exit_price', 'pnl', 'pnl_percentage']:
-                    if trade.get(key) is not None:
-                        trade[key] = round(float(trade[key]), 4)
+            # Prices and PnL go out unrounded; the dashboard formats them with toFixed
 
-            return jsonify(trades)
+            return _json(trades)
         except Exception as e:
             logger.error(f"Error getting trades: {e}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
 
     @app.route('/api/chart-data')
     def get_chart_data():
         """Get data for charts"""
         try:
-            chart_data = backtester.get_performance_chart_data()
-            return jsonify(chart_data)
+            return cached_json('chart_data', backtester.get_performance_chart_data)
         except Exception as e:
             logger.error(f"Error getting chart data: {e}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
 
     @app.route('/api/token-performance')
     def get_token_performance():
         """Get performance by token"""
         try:
-            token_stats = backtester.get_token_performance()
-            return jsonify(token_stats)
+            return cached_json('token_performance', backtester.get_token_performance)
         except Exception as e:
             logger.error(f"Error getting token performance: {e}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
 
     @app.route('/api/system-status')
     def get_system_status():
         """Get system status"""
         try:
-            open_trades = db_manager.get_open_trades()
-            all_trades = db_manager.get_all_trades()
-
             status = {
                 'is_running': True,
                 'start_time': datetime.now().isoformat(),
-                'open_trades_count': len(open_trades),
-                'total_trades_count': len(all_trades),
+                'open_trades_count': db_manager.count_open_trades(),
+                'total_trades_count': db_manager.count_all_trades(),
                 'channel_monitored': config.CHANNEL_USERNAME,
                 'take_profit': config.TAKE_PROFIT_PERCENTAGE,
                 'stop_loss': config.STOP_LOSS_PERCENTAGE,
                 'risk_reward_ratio': config.RISK_REWARD_RATIO,
             }
-            return jsonify(status)
+            return _json(status)
         except Exception as e:
             logger.error(f"Error getting system status: {e}")
-            return jsonify({'error': str(e)}), 500
+            return _json({'error': str(e)}, 500)
 
     return app
\ No newline at end of file